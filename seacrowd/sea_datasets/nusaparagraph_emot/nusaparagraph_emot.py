@@ -1,7 +1,31 @@
+import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 import datasets
-import pandas as pd
+
+# numpy/pyarrow are imported lazily inside the data-loading methods so
+# that merely constructing the builder (e.g. for config/feature
+# introspection) does not pay their import cost
+try:
+    import numba
+    import numpy as np
+
+    @numba.njit(cache=True)
+    def _copy_label_codes(codes):
+        out = np.empty(codes.shape[0], dtype=np.int64)
+        for i in range(codes.shape[0]):
+            out[i] = codes[i]
+        return out
+except ImportError:  # numba is optional; fall back to plain Python
+    numba = None
+
+try:
+    # Optional Cython row emitter (see _yield_rows.pyx); falls back to
+    # the pure-Python loop when the extension is not built
+    from ._yield_rows import emit as _emit_rows
+except ImportError:
+    _emit_rows = None
 from seacrowd.utils import schemas
 from seacrowd.utils.configs import SEACrowdConfig
 from seacrowd.utils.constants import (DEFAULT_SEACROWD_VIEW_NAME,
@@ -32,6 +56,7 @@ _LICENSE = "Creative Commons Attribution Share-Alike 4.0 International"
 _SUPPORTED_TASKS = [Tasks.EMOTION_CLASSIFICATION]
 _SOURCE_VERSION = "1.0.0"
 _SEACROWD_VERSION = "1.0.0"
+_SCHEMAS = (("source", _SOURCE_VERSION), ("seacrowd_text", _SEACROWD_VERSION))
 _URLS = {
     "train":
     "https://raw.githubusercontent.com/IndoNLP/nusa-writes/main/data/nusa_alinea-emot-{lang}-train.csv",
@@ -42,29 +67,30 @@ _URLS = {
 }
 def seacrowd_config_constructor(lang, schema, version):
     """Construct SEACrowdConfig with nusaparagraph_emot_{lang}_{schema} as the name format"""
-    if schema != "source" and schema != "seacrowd_text":
-        raise ValueError(f"Invalid schema: {schema}")
     if lang == "":
-        return SEACrowdConfig(
-            name="nusaparagraph_emot_{schema}".format(schema=schema),
+        config = SEACrowdConfig(
+            name=f"nusaparagraph_emot_{schema}",
             version=datasets.Version(version),
             description=
-            "nusaparagraph_emot with {schema} schema for all 10 languages".
-            format(schema=schema),
+            f"nusaparagraph_emot with {schema} schema for all 10 languages",
             schema=schema,
             subset_id="nusaparagraph_emot",
         )
     else:
-        return SEACrowdConfig(
-            name="nusaparagraph_emot_{lang}_{schema}".format(lang=lang,
-                                                             schema=schema),
+        config = SEACrowdConfig(
+            name=f"nusaparagraph_emot_{lang}_{schema}",
             version=datasets.Version(version),
             description=
-            "nusaparagraph_emot with {schema} schema for {lang} language".
-            format(lang=lang, schema=schema),
+            f"nusaparagraph_emot with {schema} schema for {lang} language",
             schema=schema,
             subset_id="nusaparagraph_emot",
         )
+    # Keep the language on the config so the builder does not have to
+    # parse it back out of the config name ("" means all languages)
+    config.lang = lang
+    return config
+_LABELS = ["fear", "disgusted", "sad", "happy", "angry", "surprise", "shame"]
+_KEYS = ("id", "text", "label")
 LANGUAGES_MAP = {
     "btk": "batak",
     "bew": "betawi",
@@ -79,17 +105,11 @@ LANGUAGES_MAP = {
 }
 class NusaParagraphEmot(datasets.GeneratorBasedBuilder):
     """NusaParagraph-Emot is a 7-labels (fear, disgusted, sad, happy, angry, surprise, and shame) emotion classification dataset for 10 Indonesian local languages."""
-    BUILDER_CONFIGS = ([
-        seacrowd_config_constructor(lang, "source", _SOURCE_VERSION)
-        for lang in LANGUAGES_MAP
-    ] + [
-        seacrowd_config_constructor(lang, "seacrowd_text",
-                                     _SEACROWD_VERSION)
-        for lang in LANGUAGES_MAP
-    ] + [
-        seacrowd_config_constructor("", "source", _SOURCE_VERSION),
-        seacrowd_config_constructor("", "seacrowd_text", _SEACROWD_VERSION)
-    ])
+    BUILDER_CONFIGS = [
+        seacrowd_config_constructor(lang, schema, version)
+        for schema, version in _SCHEMAS
+        for lang in list(LANGUAGES_MAP) + [""]
+    ]
     DEFAULT_CONFIG_NAME = "nusaparagraph_emot_ind_source"
     def _info(self) -> datasets.DatasetInfo:
         if self.config.schema == "source":
@@ -99,10 +119,7 @@ class NusaParagraphEmot(datasets.GeneratorBasedBuilder):
                 "label": datasets.Value("string"),
             })
         elif self.config.schema == "seacrowd_text":
-            features = schemas.text_features([
-                "fear", "disgusted", "sad", "happy", "angry", "surprise",
-                "shame"
-            ])
+            features = schemas.text_features(_LABELS)
         return datasets.DatasetInfo(
             description=_DESCRIPTION,
             features=features,
@@ -114,31 +131,43 @@ class NusaParagraphEmot(datasets.GeneratorBasedBuilder):
             self, dl_manager: datasets.DownloadManager
     ) -> List[datasets.SplitGenerator]:
         """Returns SplitGenerators."""
-        if self.config.name == "nusaparagraph_emot_source" or self.config.name == "nusaparagraph_emot_seacrowd_text":
-            # Load all 12 languages
-            train_csv_path = dl_manager.download_and_extract([
-                _URLS["train"].format(lang=lang)
-                for lang in LANGUAGES_MAP
-            ])
-            validation_csv_path = dl_manager.download_and_extract([
-                _URLS["validation"].format(lang=lang)
-                for lang in LANGUAGES_MAP
-            ])
-            test_csv_path = dl_manager.download_and_extract([
-                _URLS["test"].format(lang=lang)
-                for lang in LANGUAGES_MAP
-            ])
+        # The corpus is many small CSVs: retry transient failures here
+        # and fetch all (split, language) URLs concurrently below. For
+        # Hub-hosted data, exporting HF_HUB_ENABLE_HF_TRANSFER=1 (with
+        # the optional hf_transfer package installed) can speed downloads
+        # further, but these raw.githubusercontent.com URLs never go
+        # through that client, so it is not set here.
+        dl_manager.download_config.max_retries = 3
+        # One flat URL mapping over every (split, language) pair so a
+        # single download call shares the connection pool across splits,
+        # fetches concurrently, and downloads any duplicate URL only once
+        langs = (list(LANGUAGES_MAP)
+                 if self.config.lang == "" else [self.config.lang])
+        dl_manager.download_config.num_proc = min(30, 3 * len(langs))
+        urls = {
+            f"{split}_{lang}": _URLS[split].format(lang=lang)
+            for split in ("train", "validation", "test")
+            for lang in langs
+        }
+        csv_paths = dl_manager.download_and_extract(urls)
+        if self.config.lang == "":
+            # The corpus is immutable per version, so concatenate each
+            # split into one Parquet file on first run and re-read that
+            # (columnar + compressed) on subsequent runs
+            train_csv_path = self._cache_parquet(
+                dl_manager, "train",
+                [csv_paths[f"train_{lang}"] for lang in langs])
+            validation_csv_path = self._cache_parquet(
+                dl_manager, "validation",
+                [csv_paths[f"validation_{lang}"] for lang in langs])
+            test_csv_path = self._cache_parquet(
+                dl_manager, "test",
+                [csv_paths[f"test_{lang}"] for lang in langs])
         else:
-            lang = self.config.name.split('_')[2]
-            train_csv_path = Path(
-                dl_manager.download_and_extract(
-                    _URLS["train"].format(lang=lang)))
-            validation_csv_path = Path(
-                dl_manager.download_and_extract(
-                    _URLS["validation"].format(lang=lang)))
-            test_csv_path = Path(
-                dl_manager.download_and_extract(
-                    _URLS["test"].format(lang=lang)))
+            lang = self.config.lang
+            train_csv_path = Path(csv_paths[f"train_{lang}"])
+            validation_csv_path = Path(csv_paths[f"validation_{lang}"])
+            test_csv_path = Path(csv_paths[f"test_{lang}"])
         return [
             datasets.SplitGenerator(
                 name=datasets.Split.TRAIN,
@@ -153,18 +182,117 @@ class NusaParagraphEmot(datasets.GeneratorBasedBuilder):
                 gen_kwargs={"filepath": test_csv_path},
             ),
         ]
+    def _cache_parquet(self, dl_manager: datasets.DownloadManager,
+                       split: str, csv_files: List[str]) -> str:
+        """Concatenate the per-language CSVs of one split into a single
+        Parquet file in the download cache, reusing it when present."""
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        import pyarrow.parquet as pq
+
+        cache_dir = (dl_manager.download_config.cache_dir
+                     or datasets.config.DOWNLOADED_DATASETS_PATH)
+        os.makedirs(str(cache_dir), exist_ok=True)
+        parquet_path = os.path.join(
+            str(cache_dir), f"nusaparagraph_emot_all_{split}.parquet")
+        # Rebuild on force_download so a forced re-download of the CSVs
+        # is not silently served from a stale Parquet cache
+        if (dl_manager.download_config.force_download
+                or not os.path.exists(parquet_path)):
+            # The per-file id column is replaced by a running index at
+            # generation time, so skip parsing (and storing) it entirely.
+            # Memory-map the files so the OS page cache serves re-reads
+            # without a user-space copy.
+            tables = []
+            for fp in csv_files:
+                with pa.memory_map(str(fp), "r") as source:
+                    tables.append(
+                        pacsv.read_csv(
+                            source,
+                            read_options=pacsv.ReadOptions(use_threads=True),
+                            convert_options=pacsv.ConvertOptions(
+                                include_columns=["text", "label"])))
+            # Write to a temp file and rename into place so an
+            # interrupted write can never be mistaken for a valid cache
+            tmp_path = parquet_path + ".incomplete"
+            pq.write_table(
+                pa.concat_tables(tables), tmp_path, compression="zstd")
+            os.replace(tmp_path, parquet_path)
+        return parquet_path
+
     def _generate_examples(self, filepath: Path) -> Tuple[int, Dict]:
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pacsv
+        import pyarrow.parquet as pq
+
         if self.config.schema != "source" and self.config.schema != "seacrowd_text":
             raise ValueError(f"Invalid config: {self.config.name}")
-        if self.config.name == "nusaparagraph_emot_source" or self.config.name == "nusaparagraph_emot_seacrowd_text":
-            ldf = []
-            for fp in filepath:
-                ldf.append(pd.read_csv(fp))
-            df = pd.concat(ldf, axis=0, ignore_index=True).reset_index()
-            # Have to use index instead of id to avoid duplicated key
-            df = df.drop(columns=["id"]).rename(columns={"index": "id"})
+        # The label column only has 7 distinct values, so intern them and
+        # share the same str objects across all yielded examples. For the
+        # seacrowd_text schema, encode labels to their ClassLabel index up
+        # front so the Arrow writer skips str2int on every row.
+        label_cache = {}
+        label2id = None
+        if self.config.schema == "seacrowd_text":
+            label2id = {name: idx for idx, name in enumerate(_LABELS)}
+        if self.config.lang == "":
+            # Stream the cached Parquet in bounded-size batches instead of
+            # materializing the whole corpus before the first yield
+            counter = 0
+            parquet_file = pq.ParquetFile(filepath)
+            label_value_set = pa.array(_LABELS)
+            # Peak memory is bounded by one decoded batch; setting
+            # NUSAPARAGRAPH_LOW_MEMORY tightens that bound for
+            # memory-constrained environments
+            batch_size = (4096 if os.environ.get("NUSAPARAGRAPH_LOW_MEMORY")
+                          else 8192)
+            for batch in parquet_file.iter_batches(
+                    batch_size=batch_size, columns=["text", "label"]):
+                texts = batch.column("text").to_pylist()
+                if label2id is not None:
+                    # Encode the whole batch to ClassLabel indices at
+                    # C speed, with an optional numba kernel for the
+                    # final int64 materialization
+                    codes = pc.index_in(
+                        batch.column("label"), value_set=label_value_set)
+                    if numba is not None:
+                        batch_labels = _copy_label_codes(
+                            codes.to_numpy(zero_copy_only=False))
+                    else:
+                        batch_labels = codes.to_pylist()
+                else:
+                    batch_labels = [
+                        label_cache.setdefault(label, sys.intern(label))
+                        for label in batch.column("label").to_pylist()
+                    ]
+                # Have to use a running index instead of id to avoid
+                # duplicated key; numpy formats the whole batch of ids
+                # in one vectorized pass
+                batch_ids = np.arange(
+                    counter, counter + batch.num_rows).astype("U10")
+                if _emit_rows is not None:
+                    yield from _emit_rows(batch_ids, texts, batch_labels,
+                                          counter)
+                    counter += batch.num_rows
+                else:
+                    for values in zip(batch_ids, texts, batch_labels):
+                        yield counter, dict(zip(_KEYS, values))
+                        counter += 1
         else:
-            df = pd.read_csv(filepath).reset_index()
-        for row in df.itertuples():
-            ex = {"id": str(row.id), "text": row.text, "label": row.label}
-            yield row.id, ex
+            with pa.memory_map(str(filepath), "r") as source:
+                table = pacsv.read_csv(
+                    source, read_options=pacsv.ReadOptions(use_threads=True))
+            ids = table.column("id").to_pylist()
+            # Format the id column once at C speed instead of calling
+            # str() per row
+            id_strs = pc.cast(table.column("id"), "string").to_pylist()
+            texts = table.column("text").to_pylist()
+            labels = table.column("label").to_pylist()
+            for key, id_str, text, label in zip(ids, id_strs, texts, labels):
+                if label2id is not None:
+                    label = label2id[label]
+                else:
+                    label = label_cache.setdefault(label, sys.intern(label))
+                yield key, dict(zip(_KEYS, (id_str, text, label)))